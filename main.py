@@ -2,6 +2,16 @@ import argparse
 import sys
 from src.orchestrator import Orchestrator
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description="Map stocks to their respective industry.")
     group = parser.add_mutually_exclusive_group(required=True)
@@ -9,18 +19,23 @@ def main():
     group.add_argument('--full-refresh', action='store_true', help='Rebuild database from scratch.')
 
     parser.add_argument('--frequency', choices=['daily', 'weekly', 'monthly'], default='weekly', help='Run frequency for retry tuning.')
+    parser.add_argument('--workers', type=positive_int, default=None, help='Concurrent industry-info fetches per exchange (default: 8 NSE, 4 BSE).')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached per-symbol lookups and re-fetch them (results are still cached).')
 
     args = parser.parse_args()
 
-    orchestrator = Orchestrator(frequency=args.frequency)
+    orchestrator = Orchestrator(frequency=args.frequency, max_workers=args.workers, use_cache=not args.no_cache)
 
-    if args.full_refresh:
-        orchestrator.full_refresh()
-    elif args.refresh:
-        orchestrator.refresh()
-    else:
-        parser.print_help()
-        sys.exit(1)
+    try:
+        if args.full_refresh:
+            orchestrator.full_refresh()
+        elif args.refresh:
+            orchestrator.refresh()
+        else:
+            parser.print_help()
+            sys.exit(1)
+    finally:
+        orchestrator.close()
 
 if __name__ == "__main__":
     main()
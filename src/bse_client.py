@@ -1,17 +1,25 @@
-import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from exchange_access import BSEClient as ExchangeBSEClient
-from exchange_access import RetryProfile, build_retry
 import os
 
+from src.cache import IndustryCache
+from src.concurrency import ordered_map
+from src.models import IndustryInfo
+from src.rate_limiter import TokenBucket
+
 class BSEClient:
-    def __init__(self, download_folder="./temp_downloads", frequency="weekly"):
+    def __init__(self, download_folder="./temp_downloads", retry_profile: str = "bulk", max_workers: int = 4,
+                 cache: Optional[IndustryCache] = None):
         os.makedirs(download_folder, exist_ok=True)
-        retry_profile = "bulk" if frequency in ("weekly", "monthly") else "default"
         self._exchange = ExchangeBSEClient(download_folder=download_folder, retry_profile=retry_profile)
 
-    def set_retry_config(self, max_attempts: int, max_wait: int):
-        pass
+        # Concurrency for get_industry_info_batch. All workers draw from one
+        # BSE-only token bucket, so only network latency is overlapped.
+        self.max_workers = max_workers
+        self.rate_limiter = TokenBucket(rate=10, burst=20)
+
+        # Optional local memo; fresh entries skip the network entirely
+        self.cache = cache
 
     def _fetch_securities(self, group='A'):
         """Fetches securities with retry."""
@@ -50,10 +58,22 @@ class BSEClient:
 
         return result
 
-    def get_industry_info(self, scrip_code: str, symbol: Optional[str] = None) -> Optional[List[str]]:
+    def get_securities_indexed(self) -> Dict[str, Dict[str, str]]:
+        """
+        Fetches BSE securities keyed by symbol, in listing order.
+        If a symbol is listed more than once, the first listing wins.
+        """
+        index: Dict[str, Dict[str, str]] = {}
+        for sec in self.get_securities():
+            index.setdefault(sec['symbol'], sec)
+        return index
+
+    def get_industry_info(self, scrip_code: str, symbol: Optional[str] = None,
+                          use_cache: bool = True) -> Optional[IndustryInfo]:
         """
         Fetches industry info for a BSE scrip code.
-        Returns [Macro, Sector, Industry, Basic Industry] or None if not found.
+        use_cache=False skips cache reads; the result is still written back.
+        Returns an IndustryInfo or None if not found.
         Maps BSE fields:
         Sector -> Macro
         IndustryNew -> Sector
@@ -63,27 +83,49 @@ class BSEClient:
         if symbol and symbol.endswith('-RE'):
             return None
 
+        if self.cache and use_cache:
+            cached = self.cache.get('BSE', scrip_code)
+            if cached is not None:
+                # [] marks a recent miss
+                return IndustryInfo.from_levels(*cached) if cached else None
+
+        info = None
         try:
-            # Add a small delay
-            time.sleep(0.1)
+            # Be polite: shared across worker threads, so the aggregate rate is capped
+            self.rate_limiter.acquire()
 
             meta_info = self._fetch_meta_info(scrip_code)
 
             if meta_info:
-                sector = meta_info.get('Sector')
-                industry_new = meta_info.get('IndustryNew')
-                igroup = meta_info.get('IGroup')
-                isubgroup = meta_info.get('ISubGroup')
-
-                # Check if any field is populated
-                if any([sector, industry_new, igroup, isubgroup]):
-                    return [
-                        sector or "-",
-                        industry_new or "-",
-                        igroup or "-",
-                        isubgroup or "-"
-                    ]
-            return None
+                info = IndustryInfo.from_levels(
+                    meta_info.get('Sector'),
+                    meta_info.get('IndustryNew'),
+                    meta_info.get('IGroup'),
+                    meta_info.get('ISubGroup'),
+                )
         except Exception:
             # print(f"Error fetching info for scrip {scrip_code}: {e}")
             return None
+
+        if self.cache:
+            if info:
+                self.cache.put('BSE', scrip_code, "", info)
+            else:
+                # Errors return above, so this is a clean "no data" answer
+                self.cache.put_miss('BSE', scrip_code)
+        return info
+
+    def get_industry_info_batch(
+        self, securities: Iterable[Dict[str, str]], use_cache: bool = True
+    ) -> Iterator[Tuple[Dict[str, str], Optional[IndustryInfo]]]:
+        """
+        Fetches industry info for many BSE securities concurrently (see ordered_map).
+        Each item is a dict from get_securities().
+        Yields (item, info) pairs in input order, so store writes (and the
+        artifact's key order) don't depend on fetch timing; info is None if not found.
+        """
+        return ordered_map(
+            lambda item: self.get_industry_info(item['scrip_code'], item['symbol'], use_cache),
+            securities,
+            self.max_workers,
+        )
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Local memo of exchange lookups, keyed by (exchange, symbol, series).
+# BSE entries use the scrip code as symbol and an empty series.
+# Industry classification is slow-moving, so entries stay fresh for weeks.
+# Misses are cached too (as an empty list) with a shorter TTL, so symbols
+# without data aren't re-fetched on every run yet recover quickly. The
+# orchestrator sizes it to the run frequency; the default is one day.
+
+class IndustryCache:
+    def __init__(self, path: str = ".cache/industry_cache.db", ttl_days: float = 30,
+                 negative_ttl_days: float = 1, batch_size: int = 500):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.negative_ttl_seconds = negative_ttl_days * 86400
+        self.batch_size = batch_size
+
+        # Writes are buffered and committed batch_size rows per transaction
+        self._pending: Dict[Tuple[str, str, str], Tuple[str, int]] = {}
+
+        # One long-lived connection shared by the adapters' worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS industry ("
+            "exchange TEXT, symbol TEXT, series TEXT, data TEXT, ts INTEGER, "
+            "PRIMARY KEY (exchange, symbol, series))"
+        )
+        self._conn.commit()
+
+    def get(self, exchange: str, symbol: str, series: str = "") -> Optional[List[str]]:
+        """
+        Returns cached industry info if fetched within the TTL, else None.
+        An empty list means a recent lookup found no data.
+        """
+        key = (exchange, str(symbol), series)
+        with self._lock:
+            row = self._pending.get(key)
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT data, ts FROM industry WHERE exchange = ? AND symbol = ? AND series = ?",
+                    key,
+                ).fetchone()
+        if row is None:
+            return None
+        info = json.loads(row[0])
+        ttl = self.ttl_seconds if info else self.negative_ttl_seconds
+        if time.time() - row[1] > ttl:
+            return None
+        return info
+
+    def put(self, exchange: str, symbol: str, series: str, info: List[str]):
+        """Buffers freshly fetched industry info; flushes once batch_size rows are pending."""
+        with self._lock:
+            self._pending[(exchange, str(symbol), series)] = (json.dumps(info, ensure_ascii=False), int(time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def put_miss(self, exchange: str, symbol: str, series: str = ""):
+        """Records that a lookup returned no data."""
+        self.put(exchange, symbol, series, [])
+
+    def flush(self):
+        """Writes all buffered rows in a single transaction."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO industry VALUES (?, ?, ?, ?, ?)",
+                [key + row for key, row in self._pending.items()],
+            )
+        self._pending.clear()
+
+    def close(self):
+        """Flushes buffered rows and closes the connection."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
@@ -0,0 +1,36 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Calls per worker ordered_map may hold started but unyielded: keeps the pool
+# fed behind a slow item while bounding memory and the interrupt drain
+IN_FLIGHT_PER_WORKER = 4
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], max_workers: int,
+                window: Optional[int] = None) -> Iterator[Tuple[T, R]]:
+    """
+    Runs fn over items on one thread pool and yields (item, result) in input order.
+    At most `window` calls (default IN_FLIGHT_PER_WORKER * max_workers) are started
+    but not yet yielded; the next is submitted as each is yielded, so a slow item
+    holds back at most one window. An exception from fn is raised at its position.
+    Closing the generator cancels calls that haven't started.
+    """
+    if window is None:
+        window = max_workers * IN_FLIGHT_PER_WORKER
+    items = iter(items)
+    queued = deque()  # (item, future) in input order, not yet yielded
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            for item in islice(items, window - len(queued)):
+                queued.append((item, executor.submit(fn, item)))
+            if not queued:
+                break
+            item, future = queued.popleft()
+            yield item, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
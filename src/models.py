@@ -0,0 +1,25 @@
+import sys
+from typing import NamedTuple, Optional
+
+class IndustryInfo(NamedTuple):
+    """One symbol's classification, in the order of Store.metadata."""
+    macro: str
+    sector: str
+    industry: str
+    basic_industry: str
+
+    @classmethod
+    def from_levels(cls, macro, sector, industry, basic_industry) -> Optional["IndustryInfo"]:
+        """
+        Builds an IndustryInfo from raw exchange fields, or None if all are empty.
+        Empty levels become "-". Values are interned: a few hundred distinct
+        levels repeat across thousands of symbols.
+        """
+        if not (macro or sector or industry or basic_industry):
+            return None
+        return cls(
+            sys.intern(macro or "-"),
+            sys.intern(sector or "-"),
+            sys.intern(industry or "-"),
+            sys.intern(basic_industry or "-"),
+        )
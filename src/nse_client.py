@@ -1,24 +1,60 @@
 import csv
 import io
-import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from exchange_access import NSEClient as ExchangeNSEClient
-from exchange_access import RetryProfile, build_retry
 import os
 
+from src.cache import IndustryCache
+from src.concurrency import ordered_map
+from src.models import IndustryInfo
+from src.rate_limiter import TokenBucket
+
+# Rights entitlements and partly-paid lines carry no industry data of their own
+_SKIP_SUFFIXES = ('-RE', '-PP', '-RR')
+# Equity series on the Mainboard and SME lists; anything else is not fetched
+_EQUITY_SERIES = frozenset({'EQ', 'BE', 'BZ', 'SM', 'ST', 'SZ'})
+
+def _extract_industry_info(data) -> Optional[IndustryInfo]:
+    """Extracts (Macro, Sector, Industry, Basic Industry) from a getDetailedScripData response."""
+    # Check if valid data
+    if 'equityResponse' in data and len(data['equityResponse']) > 0:
+        sec_info = data['equityResponse'][0].get('secInfo')
+
+        # Check if secInfo is None (which happens for marketType mismatch)
+        if not sec_info:
+            return None
+
+        return IndustryInfo.from_levels(
+            sec_info.get('macro'),
+            sec_info.get('sector'),
+            sec_info.get('industryInfo'),
+            sec_info.get('basicIndustry'),
+        )
+    return None
+
 class NSEClient:
-    def __init__(self, download_folder="./temp_downloads", frequency="weekly"):
+    def __init__(self, download_folder="./temp_downloads", retry_profile: str = "bulk", max_workers: int = 8,
+                 cache: Optional[IndustryCache] = None, market_types: Tuple[str, ...] = ("N", "G")):
         os.makedirs(download_folder, exist_ok=True)
-        server_mode = os.environ.get('GITHUB_ACTIONS') == 'true'
-        if server_mode:
-            print("Running in server mode (GitHub Actions detected). Using httpx/http2.")
-
-        retry_profile = "bulk" if frequency in ("weekly", "monthly") else "default"
-        self._exchange = ExchangeNSEClient(download_folder=download_folder, server=server_mode, retry_profile=retry_profile)
+        # Always use the httpx/http2 transport: concurrent symbol fetches then
+        # multiplex over one TLS connection instead of one socket per request.
+        self._exchange = ExchangeNSEClient(download_folder=download_folder, server=True, retry_profile=retry_profile)
         self.base_url = "https://www.nseindia.com/api"
+        # marketType fallback order for getDetailedScripData:
+        # Normal Market (N), then Periodic Call Auction Market (G)
+        self.market_types = market_types
 
-    def set_retry_config(self, max_attempts: int, max_wait: int):
-        pass
+        # Concurrency for get_industry_info_batch. All workers draw from one
+        # NSE-only token bucket, so only network latency is overlapped.
+        self.max_workers = max_workers
+        self.rate_limiter = TokenBucket(rate=10, burst=20)
+
+        # Optional local memo; fresh entries skip the network entirely
+        self.cache = cache
+
+        # Symbol lists are downloaded at most once per client lifetime
+        self._mainboard_cache: Optional[List[Dict[str, str]]] = None
+        self._sme_cache: Optional[List[Dict[str, str]]] = None
 
     def _fetch_url(self, url, params=None):
         """Fetches a URL with retries."""
@@ -26,122 +62,130 @@ class NSEClient:
 
     def _fetch_detailed_scrip_data_with_retry(self, symbol: str, series: str, market_type: str = "N"):
         """Fetches detailed scrip data with retries and optional market type."""
+        # Be polite: one token per request (the marketType fallback can make
+        # two per symbol), shared across worker threads, so the aggregate rate is capped
+        self.rate_limiter.acquire()
         return self._exchange.get_detailed_scrip_data(
             symbol, series, market_type=market_type
         )
 
-    def get_mainboard_symbols(self) -> List[Dict[str, str]]:
-        """Fetches Mainboard symbols and series from CSV."""
-        url = "https://nsearchives.nseindia.com/content/equities/EQUITY_L.csv"
-        print(f"Fetching Mainboard CSV from {url}...")
+    def _fetch_symbols_csv(self, url: str, label: str) -> List[Dict[str, str]]:
+        """Fetches an NSE equity list CSV and returns its symbols and series."""
+        print(f"Fetching {label} CSV from {url}...")
         try:
             response = self._fetch_url(url)
-            if response.status_code == 200:
-                csv_content = response.content.decode('utf-8')
-                # Sometimes headers have leading/trailing spaces, strip them
-                lines = csv_content.splitlines()
-                if lines:
-                    headers = [h.strip() for h in lines[0].split(',')]
-                    # Reconstruct with clean headers
-                    cleaned_content = ','.join(headers) + '\n' + '\n'.join(lines[1:])
-                    reader = csv.DictReader(io.StringIO(cleaned_content))
-
-                    symbols = []
-                    for row in reader:
-                        symbol = row.get('SYMBOL')
-                        series = row.get('SERIES')
-                        if symbol and series:
-                            symbols.append({'symbol': symbol.strip(), 'series': series.strip()})
-                    return symbols
-            else:
-                print(f"Failed to fetch Mainboard CSV: {response.status_code}")
+            if response.status_code != 200:
+                print(f"Failed to fetch {label} CSV: {response.status_code}")
                 return []
-        except Exception as e:
-            print(f"Error fetching Mainboard CSV: {e}")
-            return []
 
-    def get_sme_symbols(self) -> List[Dict[str, str]]:
-        """Fetches SME symbols and series from CSV."""
-        url = "https://nsearchives.nseindia.com/emerge/corporates/content/SME_EQUITY_L.csv"
-        print(f"Fetching SME CSV from {url}...")
-        try:
-            response = self._fetch_url(url)
-            if response.status_code == 200:
-                csv_content = response.content.decode('utf-8')
-                lines = csv_content.splitlines()
-                if lines:
-                    headers = [h.strip() for h in lines[0].split(',')]
-                    cleaned_content = ','.join(headers) + '\n' + '\n'.join(lines[1:])
-                    reader = csv.DictReader(io.StringIO(cleaned_content))
-
-                    symbols = []
-                    for row in reader:
-                        symbol = row.get('SYMBOL')
-                        series = row.get('SERIES')
-                        if symbol and series:
-                            symbols.append({'symbol': symbol.strip(), 'series': series.strip()})
-                    return symbols
-            else:
-                print(f"Failed to fetch SME CSV: {response.status_code}")
+            reader = csv.reader(io.StringIO(response.content.decode('utf-8')))
+            # Sometimes headers have leading/trailing spaces, strip them
+            headers = [h.strip() for h in next(reader, [])]
+            if 'SYMBOL' not in headers or 'SERIES' not in headers:
+                print(f"Unexpected {label} CSV headers: {headers}")
                 return []
+            symbol_idx = headers.index('SYMBOL')
+            series_idx = headers.index('SERIES')
+            min_len = max(symbol_idx, series_idx) + 1
+
+            symbols = []
+            # Local binding skips the per-cell method lookup in the row loop
+            strip = str.strip
+            for row in reader:
+                if len(row) < min_len:
+                    continue
+                symbol = strip(row[symbol_idx])
+                series = strip(row[series_idx])
+                if not symbol or series not in _EQUITY_SERIES:
+                    continue
+                if symbol.endswith(_SKIP_SUFFIXES):
+                    continue
+                symbols.append({'symbol': symbol, 'series': series})
+            return symbols
         except Exception as e:
-            print(f"Error fetching SME CSV: {e}")
+            print(f"Error fetching {label} CSV: {e}")
             return []
 
-    def get_industry_info(self, symbol: str, series: str) -> Optional[List[str]]:
+    def get_mainboard_symbols(self) -> List[Dict[str, str]]:
+        """Fetches Mainboard symbols and series from CSV."""
+        if self._mainboard_cache is None:
+            symbols = self._fetch_symbols_csv(
+                "https://nsearchives.nseindia.com/content/equities/EQUITY_L.csv", "Mainboard"
+            )
+            if not symbols:
+                # Don't pin a failed download; the next call retries
+                return symbols
+            self._mainboard_cache = symbols
+        return self._mainboard_cache
+
+    def get_sme_symbols(self) -> List[Dict[str, str]]:
+        """Fetches SME symbols and series from CSV."""
+        if self._sme_cache is None:
+            symbols = self._fetch_symbols_csv(
+                "https://nsearchives.nseindia.com/emerge/corporates/content/SME_EQUITY_L.csv", "SME"
+            )
+            if not symbols:
+                return symbols
+            self._sme_cache = symbols
+        return self._sme_cache
+
+    def refresh_symbol_lists(self):
+        """Drops the cached Mainboard/SME lists so the next call re-downloads them."""
+        self._mainboard_cache = None
+        self._sme_cache = None
+
+    def get_industry_info(self, symbol: str, series: str, use_cache: bool = True) -> Optional[IndustryInfo]:
         """
         Fetches industry info for a symbol using getDetailedScripData.
         Requires the correct series (e.g., 'EQ', 'BE', 'SM', 'ST').
-        Tries marketType="N" first, then "G" if data is missing.
-        Returns [Macro, Sector, Industry, Basic Industry] or None if not found.
+        Tries each of self.market_types in order (default "N", then "G")
+        until one returns data.
+        use_cache=False skips cache reads; the result is still written back.
+        Returns an IndustryInfo or None if not found.
         """
-        if symbol.endswith('-RE'):
-            return None
-
-        def extract_info(data):
-            # Check if valid data
-            if 'equityResponse' in data and len(data['equityResponse']) > 0:
-                sec_info = data['equityResponse'][0].get('secInfo')
-
-                # Check if secInfo is None (which happens for marketType mismatch)
-                if not sec_info:
-                    return None
-
-                # Extract fields
-                macro = sec_info.get('macro')
-                sector = sec_info.get('sector')
-                industry_info = sec_info.get('industryInfo')
-                basic_industry = sec_info.get('basicIndustry')
-
-                # Check if any field is populated
-                if any([macro, sector, industry_info, basic_industry]):
-                    return [
-                        macro or "-",
-                        sector or "-",
-                        industry_info or "-",
-                        basic_industry or "-"
-                    ]
+        # Lists are already filtered; this guards direct callers
+        if symbol.endswith(_SKIP_SUFFIXES):
             return None
 
-        # Add a small delay to be polite
-        time.sleep(0.1)
+        if self.cache and use_cache:
+            cached = self.cache.get('NSE', symbol, series)
+            if cached is not None:
+                # [] marks a recent miss
+                return IndustryInfo.from_levels(*cached) if cached else None
 
+        info = None
+        failed = False
         try:
-            # Try Normal Market first (N)
-            data = self._fetch_detailed_scrip_data_with_retry(symbol, series, market_type="N")
-            info = extract_info(data)
-
-            if info:
-                return info
-
-            # If failed (None), try Periodic Call Auction Market (G)
-            # print(f"Retrying {symbol} ({series}) with marketType='G'...")
-            data_g = self._fetch_detailed_scrip_data_with_retry(symbol, series, market_type="G")
-            return extract_info(data_g)
+            for market_type in self.market_types:
+                data = self._fetch_detailed_scrip_data_with_retry(symbol, series, market_type=market_type)
+                info = _extract_industry_info(data)
+                if info:
+                    break
 
         except Exception:
             # Log error but continue
             # print(f"Error fetching info for {symbol}: {e}")
-            pass
+            failed = True
 
-        return None
+        if self.cache:
+            if info:
+                self.cache.put('NSE', symbol, series, info)
+            elif not failed:
+                # Only a clean "no data" answer is cached, never an error
+                self.cache.put_miss('NSE', symbol, series)
+        return info
+
+    def get_industry_info_batch(
+        self, securities: Iterable[Dict[str, str]], use_cache: bool = True
+    ) -> Iterator[Tuple[Dict[str, str], Optional[IndustryInfo]]]:
+        """
+        Fetches industry info for many securities concurrently (see ordered_map).
+        Each item is a dict: {'symbol': '...', 'series': '...'}
+        Yields (item, info) pairs in input order, so store writes (and the
+        artifact's key order) don't depend on fetch timing; info is None if not found.
+        """
+        return ordered_map(
+            lambda item: self.get_industry_info(item['symbol'], item['series'], use_cache),
+            securities,
+            self.max_workers,
+        )
@@ -1,5 +1,8 @@
 import logging
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+from src.cache import IndustryCache
+from src.models import IndustryInfo
 from src.store import Store
 from src.nse_client import NSEClient
 from src.bse_client import BSEClient
@@ -8,120 +11,181 @@ from src.bse_client import BSEClient
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# exchange-access retry profile per run frequency: daily runs fail fast,
+# weekly/monthly maintenance runs tolerate longer backoff windows
+RETRY_PROFILES = {"daily": "default", "weekly": "bulk", "monthly": "bulk"}
+
+# Days a cached "no data" answer is trusted, per run frequency: just over one
+# run interval, so a miss is skipped by the next scheduled run and retried
+# by the one after
+NEGATIVE_TTL_DAYS = {"daily": 2, "weekly": 8, "monthly": 32}
+
+# Per-symbol successes log at DEBUG; INFO gets one progress line per this many
+PROGRESS_EVERY = 100
+
 class Orchestrator:
-    def __init__(self, store_path="out/industry_data.json", frequency="weekly"):
+    def __init__(self, store_path="out/industry_data.json", frequency="weekly", max_workers: Optional[int] = None,
+                 cache_path=".cache/industry_cache.db", use_cache: bool = True):
         self.store = Store(filepath=store_path)
-        self.nse_client = NSEClient(frequency=frequency)
-        self.bse_client = BSEClient(frequency=frequency)
+        self.cache = IndustryCache(path=cache_path, negative_ttl_days=NEGATIVE_TTL_DAYS.get(frequency, 1))
+        # False re-fetches every lookup from the exchanges; results are still
+        # written back to the cache
+        self.use_cache = use_cache
+        client_kwargs = {
+            'retry_profile': RETRY_PROFILES.get(frequency, "default"),
+            'cache': self.cache,
+        }
+        # Without an override each adapter keeps its own default pool size
+        if max_workers is not None:
+            client_kwargs['max_workers'] = max_workers
+        self.nse_client = NSEClient(**client_kwargs)
+        self.bse_client = BSEClient(**client_kwargs)
+
+        # (exchange, symbol) pairs already fetched this run, successful or not.
+        # Stops duplicate list entries (or a symbol on both NSE lists) from
+        # being fetched twice.
+        self._attempted: Set[Tuple[str, str]] = set()
+        # Symbols with non-empty store data; rebuilt after load/clear and kept
+        # in step with updates so membership checks are one set probe
+        self._completed: Set[str] = set()
+        # BSE securities by symbol, fetched once and shared by both refresh modes
+        self._bse_idx: Optional[Dict[str, dict]] = None
+
+    def close(self):
+        """Closes the store's journal and the cache connection."""
+        try:
+            self.store.close()
+        finally:
+            self.cache.close()
+
+    def _claim_pending(self, exchange: str, securities: Iterable[dict]) -> List[dict]:
+        """Returns securities not yet in the store nor attempted on this exchange, marking them attempted."""
+        pending = []
+        for sec in securities:
+            key = (exchange, sec['symbol'])
+            if sec['symbol'] in self._completed or key in self._attempted:
+                continue
+            self._attempted.add(key)
+            pending.append(sec)
+        return pending
+
+    def _reset_progress(self):
+        self._attempted.clear()
+        self._completed = {symbol for symbol, info in self.store.data.items() if info}
+
+    def _record(self, symbol: str, info: IndustryInfo):
+        self.store.update_stock(symbol, info)
+        self._completed.add(symbol)
 
-    def _process_nse_securities(self, securities: List[Dict[str, str]]):
+    def _process_nse_securities(self, securities: Iterable[Dict[str, str]], label: str = "NSE") -> int:
         """
-        Process a list of NSE securities.
+        Process NSE securities not yet in the store, in a single pass over `securities`.
         Each item is a dict: {'symbol': '...', 'series': '...'}
+        Returns the number of symbols fetched (0 if all were already covered).
         """
-        total = len(securities)
-        logger.info(f"Processing {total} NSE symbols...")
-
-        for i, item in enumerate(securities):
+        # Skip already processed symbols before scheduling any fetches
+        pending = self._claim_pending('NSE', securities)
+        total = len(pending)
+        if not total:
+            return 0
+        logger.info("Found %d missing/incomplete %s symbols.", total, label)
+
+        # Fetches run concurrently; store writes stay on this thread
+        for i, (item, info) in enumerate(self.nse_client.get_industry_info_batch(pending, self.use_cache)):
             symbol = item['symbol']
             series = item['series']
 
-            if symbol in self.store.data and self.store.data[symbol]:
-                # Already processed
-                continue
-
-            logger.info(f"[{i+1}/{total}] Fetching info for NSE: {symbol} ({series})")
-            info = self.nse_client.get_industry_info(symbol, series=series)
-
             if info:
-                self.store.update_stock(symbol, info)
-                logger.info(f"Updated {symbol}: {info}")
+                self._record(symbol, info)
+                logger.debug("[%d/%d] Updated %s: %s", i + 1, total, symbol, info)
             else:
-                logger.warning(f"No info found for NSE: {symbol} ({series})")
+                logger.warning("[%d/%d] No info found for NSE: %s (%s)", i + 1, total, symbol, series)
+
+            if (i + 1) % PROGRESS_EVERY == 0:
+                logger.info("[%d/%d] NSE symbols processed", i + 1, total)
 
-            if (i + 1) % 50 == 0:
-                self.store.save()
+        return total
 
-    def _process_bse_securities(self, securities: List[dict]):
-        total = len(securities)
-        logger.info(f"Processing {total} BSE securities...")
+    def _process_bse_securities(self, securities: Iterable[dict]) -> int:
+        """Same as _process_nse_securities, for items from BSEClient.get_securities()."""
+        pending = self._claim_pending('BSE', securities)
+        total = len(pending)
+        if not total:
+            return 0
+        logger.info("Found %d missing/incomplete BSE securities.", total)
 
-        for i, sec in enumerate(securities):
+        for i, (sec, info) in enumerate(self.bse_client.get_industry_info_batch(pending, self.use_cache)):
             scrip_code = sec['scrip_code']
             symbol = sec['symbol']
 
-            if symbol in self.store.data and self.store.data[symbol]:
-                continue
-
-            logger.info(f"[{i+1}/{total}] Fetching info for BSE: {symbol} ({scrip_code})")
-            info = self.bse_client.get_industry_info(scrip_code, symbol=symbol)
-
             if info:
-                self.store.update_stock(symbol, info)
-                logger.info(f"Updated {symbol}: {info}")
+                self._record(symbol, info)
+                logger.debug("[%d/%d] Updated %s: %s", i + 1, total, symbol, info)
             else:
-                logger.warning(f"No info found for BSE: {symbol} ({scrip_code})")
+                logger.warning("[%d/%d] No info found for BSE: %s (%s)", i + 1, total, symbol, scrip_code)
+
+            if (i + 1) % PROGRESS_EVERY == 0:
+                logger.info("[%d/%d] BSE securities processed", i + 1, total)
+
+        return total
 
-            if (i + 1) % 50 == 0:
-                self.store.save()
+    def _bse_index(self) -> Dict[str, dict]:
+        if self._bse_idx is None:
+            index = self.bse_client.get_securities_indexed()
+            if not index:
+                # Don't pin a failed download; the next call retries
+                return index
+            self._bse_idx = index
+        return self._bse_idx
+
+    def _fetch_universe(self) -> Tuple[List[Dict[str, str]], List[Dict[str, str]], Dict[str, dict]]:
+        """
+        Downloads the NSE Mainboard, NSE SME and BSE lists concurrently.
+        Returns (nse_main, nse_sme, bse_idx).
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            nse_main = executor.submit(self.nse_client.get_mainboard_symbols)
+            nse_sme = executor.submit(self.nse_client.get_sme_symbols)
+            bse_idx = executor.submit(self._bse_index)
+            return nse_main.result(), nse_sme.result(), bse_idx.result()
 
     def full_refresh(self):
         logger.info("Starting Full Refresh...")
         self.store.clear()
+        self._reset_progress()
+        nse_main, nse_sme, bse_idx = self._fetch_universe()
 
         # BSE (Process first)
-        bse_secs = self.bse_client.get_securities()
-        self._process_bse_securities(bse_secs)
+        self._process_bse_securities(bse_idx.values())
 
         # NSE Mainboard
         # Optimization: process only if NOT already in store (populated by BSE)
-        nse_main = self.nse_client.get_mainboard_symbols()
-        # nse_main is list of {'symbol': ..., 'series': ...}
-        nse_main_missing = [s for s in nse_main if s['symbol'] not in self.store.data or not self.store.data[s['symbol']]]
-
-        if nse_main_missing:
-            logger.info(f"Found {len(nse_main_missing)} missing/incomplete NSE Mainboard symbols (after BSE processing).")
-            self._process_nse_securities(nse_main_missing)
-        else:
+        if not self._process_nse_securities(nse_main, "NSE Mainboard"):
             logger.info("All NSE Mainboard symbols already covered by BSE data.")
 
         # NSE SME
-        nse_sme = self.nse_client.get_sme_symbols()
-        nse_sme_missing = [s for s in nse_sme if s['symbol'] not in self.store.data or not self.store.data[s['symbol']]]
-
-        if nse_sme_missing:
-            logger.info(f"Found {len(nse_sme_missing)} missing/incomplete NSE SME symbols (after BSE processing).")
-            self._process_nse_securities(nse_sme_missing)
-        else:
-             logger.info("All NSE SME symbols already covered by BSE data.")
+        if not self._process_nse_securities(nse_sme, "NSE SME"):
+            logger.info("All NSE SME symbols already covered by BSE data.")
 
+        self.cache.flush()
         self.store.save()
         logger.info("Full Refresh Complete.")
 
     def refresh(self):
         logger.info("Starting Refresh...")
         self.store.load()
+        self._reset_progress()
+        nse_main, nse_sme, bse_idx = self._fetch_universe()
 
         # NSE Mainboard
-        nse_main = self.nse_client.get_mainboard_symbols()
-        nse_main_missing = [s for s in nse_main if s['symbol'] not in self.store.data or not self.store.data[s['symbol']]]
-        if nse_main_missing:
-            logger.info(f"Found {len(nse_main_missing)} missing/incomplete NSE Mainboard symbols.")
-            self._process_nse_securities(nse_main_missing)
+        self._process_nse_securities(nse_main, "NSE Mainboard")
 
         # NSE SME
-        nse_sme = self.nse_client.get_sme_symbols()
-        nse_sme_missing = [s for s in nse_sme if s['symbol'] not in self.store.data or not self.store.data[s['symbol']]]
-        if nse_sme_missing:
-            logger.info(f"Found {len(nse_sme_missing)} missing/incomplete NSE SME symbols.")
-            self._process_nse_securities(nse_sme_missing)
-
-        # BSE
-        bse_secs = self.bse_client.get_securities()
-        bse_missing = [s for s in bse_secs if s['symbol'] not in self.store.data or not self.store.data[s['symbol']]]
-        if bse_missing:
-            logger.info(f"Found {len(bse_missing)} missing/incomplete BSE securities.")
-            self._process_bse_securities(bse_missing)
+        self._process_nse_securities(nse_sme, "NSE SME")
+
+        # BSE (dict iteration keeps listing order, so artifact key order stays stable)
+        self._process_bse_securities(bse_idx.values())
 
+        self.cache.flush()
         self.store.save()
         logger.info("Refresh Complete.")
@@ -0,0 +1,28 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket capping the aggregate request rate.
+    Allows bursts of up to `burst` requests, then `rate` requests per second.
+    """
+
+    def __init__(self, rate: float = 10, burst: int = 20):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may start."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Going negative reserves a future slot, so waiters queue fairly
+            # without sleeping while holding the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
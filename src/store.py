@@ -1,9 +1,20 @@
 import json
 import os
-from typing import Dict, List
+from typing import Dict, Optional
 
 from markets_house import write_json_atomic
 
+from src.models import IndustryInfo
+
+def _to_info(row):
+    """Converts a stored [macro, sector, industry, basic] row; other rows are kept as is."""
+    if isinstance(row, list) and len(row) == 4 and all(isinstance(v, str) for v in row):
+        return IndustryInfo.from_levels(*row) or row
+    return row
+
+# Updates between saves are appended to a JSONL journal (<filepath>.wal),
+# one [symbol, info] per line. save() compacts it into the JSON file.
+#
 # JSON Structure:
 # {
 #   "metadata": ["Macro", "Sector", "Industry", "Basic Industry"],
@@ -16,10 +27,17 @@ class Store:
     def __init__(self, filepath: str = "out/industry_data.json"):
         self.filepath = filepath
         self.metadata = ["Macro", "Sector", "Industry", "Basic Industry"]
-        self.data: Dict[str, List[str]] = {}
+        self.data: Dict[str, IndustryInfo] = {}
+        self.journal_path = filepath + ".wal"
+        self._journal = None  # opened lazily on first update
+        # False only while data matches the JSON file on disk
+        self._dirty = True
 
     def load(self):
         """Loads data from the JSON file."""
+        # Cleared only once the file is parsed; every "starting fresh" path
+        # leaves the store differing from disk
+        self._dirty = True
         if os.path.exists(self.filepath):
             try:
                 with open(self.filepath, 'r', encoding='utf-8') as f:
@@ -27,7 +45,8 @@ class Store:
                     # Validate structure
                     if "metadata" in content and "data" in content:
                         self.metadata = content["metadata"]
-                        self.data = content["data"]
+                        self.data = {symbol: _to_info(info) for symbol, info in content["data"].items()}
+                        self._dirty = False
                     else:
                         print(f"Warning: Invalid JSON structure in {self.filepath}. Starting fresh.")
                         self.data = {}
@@ -37,12 +56,53 @@ class Store:
         else:
             print(f"Info: {self.filepath} not found. Starting fresh.")
             self.data = {}
+        self._replay_journal()
+
+    def _replay_journal(self):
+        """Applies updates journaled since the last save (e.g. by an interrupted run)."""
+        if not os.path.exists(self.journal_path):
+            return
+        replayed = 0
+        # errors='replace' so a torn multi-byte tail fails JSON parsing, not decoding
+        with open(self.journal_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    pair = json.loads(line)
+                except ValueError:
+                    # A crash can leave a torn final line
+                    continue
+                # Anything but a [symbol, [levels...]] pair is skipped the same way
+                if not (isinstance(pair, list) and len(pair) == 2
+                        and isinstance(pair[0], str) and isinstance(pair[1], list)):
+                    continue
+                symbol, info = pair
+                self.data[symbol] = _to_info(info)
+                replayed += 1
+        if replayed:
+            self._dirty = True
+        print(f"Replayed {replayed} journaled updates from {self.journal_path}")
+
+    def close(self):
+        """Closes the journal file; unsaved updates stay in it for the next load()."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _discard_journal(self):
+        self.close()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
 
     def save(self):
-        """Saves data to the JSON file."""
+        """Saves data to the JSON file and compacts the journal into it."""
+        if not self._dirty:
+            print(f"No changes since load; {self.filepath} left as is")
+            return
+
         content = {
             "metadata": self.metadata,
-            "data": self.data
+            # Plain lists, so the file doesn't depend on how the encoder treats tuples
+            "data": {symbol: list(info) if info else info for symbol, info in self.data.items()}
         }
 
         # Ensure directory exists
@@ -55,19 +115,39 @@ class Store:
                 return
 
         write_json_atomic(self.filepath, content, indent=2, ensure_ascii=False)
+        # Everything journaled is now in the JSON file
+        self._discard_journal()
+        self._dirty = False
         print(f"Saved data to {self.filepath}")
 
-    def update_stock(self, symbol: str, info: List[str]):
+    def update_stock(self, symbol: str, info: IndustryInfo):
         """Updates industry info for a stock."""
-        if len(info) != 4:
-            print(f"Warning: Invalid info length for {symbol}. Expected 4, got {len(info)}.")
-            return
         self.data[symbol] = info
+        self._dirty = True
+
+        if self._journal is None:
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Terminate a torn line left by a crash so this record stays parseable
+            torn = False
+            if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            if torn:
+                self._journal.write("\n")
+        # Flushed per line so a crashed run loses at most the update in flight
+        self._journal.write(json.dumps([symbol, list(info)], ensure_ascii=False) + "\n")
+        self._journal.flush()
 
-    def get_stock(self, symbol: str) -> List[str]:
+    def get_stock(self, symbol: str) -> Optional[IndustryInfo]:
         """Returns industry info for a stock, or None if not found."""
         return self.data.get(symbol)
 
     def clear(self):
-        """Clears all data."""
+        """Clears all data, including any journaled updates."""
         self.data = {}
+        self._dirty = True
+        self._discard_journal()
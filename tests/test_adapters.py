@@ -0,0 +1,113 @@
+"""Offline tests for the NSE/BSE adapters (no network).
+
+exchange-access clients are replaced with fakes; adapter methods that would
+hit an exchange are stubbed per test.
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("exchange_access")  # producer dependency (uv sync installs it)
+
+from src import bse_client as bse_client_module
+from src import nse_client as nse_client_module
+from src.bse_client import BSEClient
+from src.models import IndustryInfo
+from src.nse_client import NSEClient
+
+
+class FakeExchange:
+    """Stands in for an exchange-access client; any use is a test bug."""
+
+    def __init__(self, **kwargs):
+        pass
+
+
+@pytest.fixture()
+def nse(monkeypatch, tmp_path):
+    monkeypatch.setattr(nse_client_module, "ExchangeNSEClient", FakeExchange)
+    return NSEClient(download_folder=str(tmp_path / "downloads"), max_workers=4)
+
+
+@pytest.fixture()
+def bse(monkeypatch, tmp_path):
+    monkeypatch.setattr(bse_client_module, "ExchangeBSEClient", FakeExchange)
+    return BSEClient(download_folder=str(tmp_path / "downloads"), max_workers=4)
+
+
+def _info(name: str) -> IndustryInfo:
+    return IndustryInfo("M", "S", "I", name)
+
+
+def test_nse_batch_yields_in_input_order_and_forwards_use_cache(nse, monkeypatch):
+    symbols = [f"SYM{i}" for i in range(12)]
+    calls = []
+
+    def fake_get_industry_info(symbol, series, use_cache=True):
+        calls.append((symbol, series, use_cache))
+        time.sleep((len(symbols) - symbols.index(symbol)) * 0.002)  # later ones finish first
+        return None if symbol == "SYM3" else _info(symbol)
+
+    monkeypatch.setattr(nse, "get_industry_info", fake_get_industry_info)
+    items = [{"symbol": s, "series": "EQ"} for s in symbols]
+    results = list(nse.get_industry_info_batch(items, use_cache=False))
+
+    assert [item for item, _ in results] == items
+    assert results[3][1] is None
+    assert results[0][1] == _info("SYM0")
+    assert {use_cache for _, _, use_cache in calls} == {False}
+
+
+def test_bse_batch_yields_in_input_order(bse, monkeypatch):
+    codes = [str(500000 + i) for i in range(12)]
+
+    def fake_get_industry_info(scrip_code, symbol=None, use_cache=True):
+        time.sleep((len(codes) - codes.index(scrip_code)) * 0.002)
+        return _info(symbol)
+
+    monkeypatch.setattr(bse, "get_industry_info", fake_get_industry_info)
+    items = [{"scrip_code": c, "symbol": f"B{c}"} for c in codes]
+    results = list(bse.get_industry_info_batch(items))
+
+    assert [item for item, _ in results] == items
+    assert [info.basic_industry for _, info in results] == [f"B{c}" for c in codes]
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.status_code = status_code
+        self.content = content
+
+
+EQUITY_CSV = (
+    b"SYMBOL, NAME OF COMPANY , SERIES ,DATE OF LISTING\n"
+    b'AAA,"A, Ltd",EQ,01-JAN-2000\n'
+    b"BEE,Bee Ltd, BE ,01-JAN-2000\n"
+    b"SHORT,Short Ltd\n"
+    b"BOND,Bond Ltd,N1,01-JAN-2000\n"
+    b"AAA-RE,A Rights,EQ,01-JAN-2000\n"
+    b"AAA-PP,A Partly Paid,EQ,01-JAN-2000\n"
+    b"AAA-RR,A Rights Renounced,EQ,01-JAN-2000\n"
+    b",Blank Ltd,EQ,01-JAN-2000\n"
+    b"SMEX,Sme Ltd,SM,01-JAN-2000\n"
+)
+
+
+def test_symbols_csv_keeps_only_equity_series_and_skips_suffixes(nse, monkeypatch):
+    monkeypatch.setattr(nse, "_fetch_url", lambda url, params=None: FakeResponse(EQUITY_CSV))
+    assert nse._fetch_symbols_csv("https://example.invalid/EQUITY_L.csv", "Mainboard") == [
+        {"symbol": "AAA", "series": "EQ"},
+        {"symbol": "BEE", "series": "BE"},
+        {"symbol": "SMEX", "series": "SM"},
+    ]
+
+
+def test_symbols_csv_rejects_unexpected_headers(nse, monkeypatch):
+    monkeypatch.setattr(nse, "_fetch_url", lambda url, params=None: FakeResponse(b"TICKER,SERIES\nAAA,EQ\n"))
+    assert nse._fetch_symbols_csv("https://example.invalid/EQUITY_L.csv", "Mainboard") == []
+
+
+def test_symbols_csv_failed_download_is_empty(nse, monkeypatch):
+    monkeypatch.setattr(nse, "_fetch_url", lambda url, params=None: FakeResponse(b"", status_code=503))
+    assert nse._fetch_symbols_csv("https://example.invalid/EQUITY_L.csv", "Mainboard") == []
@@ -0,0 +1,105 @@
+"""Offline tests for the producer's per-symbol IndustryCache (no network).
+
+Uses a tmp_path SQLite database and a patched clock, so TTL expiry is
+checked without sleeping.
+"""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from src import cache as cache_module
+from src.cache import IndustryCache
+
+DAY = 86400
+INFO = ["Macro", "Sector", "Industry", "Basic"]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake.time)
+    return fake
+
+
+@pytest.fixture()
+def cache(tmp_path, clock):
+    c = IndustryCache(path=str(tmp_path / "industry_cache.db"), ttl_days=30, negative_ttl_days=1)
+    yield c
+    c.close()
+
+
+def test_hit_is_served_within_ttl_and_expires_after(cache, clock):
+    cache.put("NSE", "AAA", "EQ", INFO)
+    cache.flush()
+
+    clock.now += 29 * DAY
+    assert cache.get("NSE", "AAA", "EQ") == INFO
+
+    clock.now += 2 * DAY
+    assert cache.get("NSE", "AAA", "EQ") is None
+
+
+def test_miss_uses_the_shorter_negative_ttl(cache, clock):
+    cache.put_miss("BSE", "500001")
+    cache.flush()
+
+    clock.now += DAY / 2
+    assert cache.get("BSE", "500001") == []
+
+    clock.now += DAY
+    assert cache.get("BSE", "500001") is None
+
+
+def test_unknown_key_is_none(cache):
+    assert cache.get("NSE", "NOPE", "EQ") is None
+
+
+def _rows_on_disk(path) -> int:
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM industry").fetchone()[0]
+
+
+def test_pending_rows_are_readable_before_flush(cache):
+    cache.put("NSE", "AAA", "EQ", INFO)
+    cache.put_miss("NSE", "BBB", "EQ")
+
+    assert _rows_on_disk(cache.path) == 0
+    assert cache.get("NSE", "AAA", "EQ") == INFO
+    assert cache.get("NSE", "BBB", "EQ") == []
+
+
+def test_buffer_flushes_at_batch_size(tmp_path, clock):
+    path = str(tmp_path / "industry_cache.db")
+    c = IndustryCache(path=path, batch_size=3)
+    c.put("NSE", "A", "EQ", INFO)
+    c.put("NSE", "B", "EQ", INFO)
+    assert _rows_on_disk(path) == 0
+
+    c.put("NSE", "C", "EQ", INFO)
+    assert _rows_on_disk(path) == 3
+
+    c.put("NSE", "D", "EQ", INFO)
+    assert _rows_on_disk(path) == 3
+    c.close()
+    assert _rows_on_disk(path) == 4
+
+
+def test_close_persists_pending_rows(tmp_path, clock):
+    path = str(tmp_path / "industry_cache.db")
+    c = IndustryCache(path=path)
+    c.put("BSE", 500001, "", INFO)
+    c.close()
+
+    reopened = IndustryCache(path=path)
+    assert reopened.get("BSE", "500001") == INFO
+    reopened.close()
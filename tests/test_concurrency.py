@@ -0,0 +1,83 @@
+"""Tests for ordered_map, the bounded thread-pool map behind the adapters' batch fetches.
+
+Synchronization uses events rather than sleeps where the outcome depends on
+which calls have started.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.concurrency import ordered_map
+
+
+def test_yields_in_input_order_regardless_of_completion_order():
+    n = 20
+
+    def fn(i):
+        time.sleep((n - i) * 0.002)  # later items finish first
+        return i * i
+
+    assert list(ordered_map(fn, range(n), max_workers=4)) == [(i, i * i) for i in range(n)]
+
+
+def test_empty_input():
+    assert list(ordered_map(lambda i: i, [], max_workers=2)) == []
+
+
+def test_window_bounds_calls_started_ahead_of_a_slow_head():
+    window = 4
+    started = []
+    window_filled = threading.Event()
+
+    def fn(i):
+        started.append(i)
+        if i == 0:
+            assert window_filled.wait(5)
+            return sorted(started)
+        if i == window - 1:
+            window_filled.set()
+        return i
+
+    results = ordered_map(fn, range(100), max_workers=2, window=window)
+    _, seen_while_head_ran = next(results)
+    # Nothing past the window is submitted until the head has been yielded
+    assert seen_while_head_ran == list(range(window))
+
+    rest = list(results)
+    assert [item for item, _ in rest] == list(range(1, 100))
+
+
+def test_close_cancels_calls_that_have_not_started():
+    started = []
+    gate = threading.Event()
+
+    def fn(i):
+        started.append(i)
+        if i > 0:
+            assert gate.wait(5)
+        return i
+
+    results = ordered_map(fn, range(100), max_workers=1, window=4)
+    assert next(results) == (0, 0)
+    # close() waits for the running call; release it once close is underway
+    release = threading.Timer(0.05, gate.set)
+    release.start()
+    results.close()
+    release.join()
+
+    assert set(started) <= {0, 1}
+
+
+def test_exception_is_raised_at_its_position():
+    def fn(i):
+        if i == 2:
+            raise ValueError("boom")
+        return i
+
+    results = ordered_map(fn, range(10), max_workers=3)
+    assert next(results) == (0, 0)
+    assert next(results) == (1, 1)
+    with pytest.raises(ValueError, match="boom"):
+        next(results)
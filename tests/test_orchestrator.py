@@ -0,0 +1,160 @@
+"""Offline tests for the producer Orchestrator (no network).
+
+The real NSE/BSE adapters run against fake exchange-access clients that
+serve canned symbol lists and industry data and count detail requests.
+"""
+
+import pytest
+
+pytest.importorskip("exchange_access")  # producer dependencies (uv sync installs them)
+pytest.importorskip("markets_house")
+
+from src import bse_client as bse_client_module
+from src import cache as cache_module
+from src import nse_client as nse_client_module
+from src.models import IndustryInfo
+from src.orchestrator import Orchestrator
+
+DAY = 86400
+
+MAINBOARD_CSV = b"SYMBOL,NAME OF COMPANY,SERIES\nAAA,A Ltd,EQ\nNODATA,No Data Ltd,EQ\nDUP,Dup Ltd,EQ\nDUP,Dup Ltd,EQ\n"
+SME_CSV = b"SYMBOL,NAME OF COMPANY,SERIES\nDUP,Dup Ltd,SM\nSMEX,Sme Ltd,SM\n"
+
+
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.status_code = 200
+        self.content = content
+
+
+class FakeNSEExchange:
+    """Stands in for exchange_access.NSEClient."""
+
+    def __init__(self):
+        self.detail_calls = []
+
+    def request(self, url, params=None):
+        return FakeResponse(SME_CSV if "SME" in url else MAINBOARD_CSV)
+
+    def get_detailed_scrip_data(self, symbol, series, market_type="N"):
+        self.detail_calls.append(symbol)
+        if symbol == "NODATA":
+            return {"equityResponse": [{"secInfo": None}]}
+        return {"equityResponse": [{"secInfo": {
+            "macro": "M", "sector": "S", "industryInfo": "I", "basicIndustry": symbol,
+        }}]}
+
+
+class FakeBSEExchange:
+    """Stands in for exchange_access.BSEClient."""
+
+    def __init__(self):
+        self.meta_calls = []
+
+    def valid_groups(self):
+        return ("A",)
+
+    def list_securities(self, group="A"):
+        return [{"SCRIP_CD": "500001", "scrip_id": "AAA"}, {"SCRIP_CD": "500002", "scrip_id": "BSEONLY"}]
+
+    def equity_meta_info(self, scrip_code):
+        self.meta_calls.append(scrip_code)
+        return {"Sector": "BM", "IndustryNew": "BS", "IGroup": "BI", "ISubGroup": scrip_code}
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def exchanges(monkeypatch, tmp_path):
+    # Adapters create ./temp_downloads; keep it inside tmp_path
+    monkeypatch.chdir(tmp_path)
+    nse, bse = FakeNSEExchange(), FakeBSEExchange()
+    monkeypatch.setattr(nse_client_module, "ExchangeNSEClient", lambda **kwargs: nse)
+    monkeypatch.setattr(bse_client_module, "ExchangeBSEClient", lambda **kwargs: bse)
+    return nse, bse
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake.time)
+    return fake
+
+
+def _orchestrator(tmp_path, frequency: str = "weekly", **kwargs) -> Orchestrator:
+    return Orchestrator(
+        store_path=str(tmp_path / "out" / "industry_data.json"),
+        frequency=frequency,
+        max_workers=2,
+        cache_path=str(tmp_path / ".cache" / "industry_cache.db"),
+        **kwargs,
+    )
+
+
+def _run(tmp_path, mode: str, frequency: str = "weekly") -> Orchestrator:
+    orchestrator = _orchestrator(tmp_path, frequency)
+    try:
+        getattr(orchestrator, mode)()
+    finally:
+        orchestrator.close()
+    return orchestrator
+
+
+def test_weekly_rerun_does_not_refetch_a_cached_miss(tmp_path, exchanges, clock):
+    nse, _ = exchanges
+    _run(tmp_path, "refresh")
+    first = nse.detail_calls.count("NODATA")
+    assert first == 2  # Normal market, then the auction-market fallback
+
+    clock.now += 7 * DAY + 3600  # next Sunday's run, started a little later
+    _run(tmp_path, "refresh")
+    assert nse.detail_calls.count("NODATA") == first
+
+    clock.now += 7 * DAY  # the run after that retries it
+    _run(tmp_path, "refresh")
+    assert nse.detail_calls.count("NODATA") == 2 * first
+
+
+def test_claim_pending_skips_duplicates_and_completed_symbols(tmp_path, exchanges):
+    orchestrator = _orchestrator(tmp_path)
+    try:
+        listed = [{"symbol": "AAA"}, {"symbol": "AAA"}, {"symbol": "BBB"}]
+        assert orchestrator._claim_pending("NSE", listed) == [{"symbol": "AAA"}, {"symbol": "BBB"}]
+        # Already attempted on NSE this run, even though it failed
+        assert orchestrator._claim_pending("NSE", [{"symbol": "AAA"}]) == []
+        # Attempts are per exchange: BSE may still try a symbol NSE missed
+        assert orchestrator._claim_pending("BSE", [{"symbol": "AAA"}]) == [{"symbol": "AAA"}]
+
+        orchestrator.store.update_stock("CCC", IndustryInfo("M", "S", "I", "B"))
+        orchestrator._reset_progress()
+        assert orchestrator._claim_pending("BSE", [{"symbol": "AAA"}, {"symbol": "CCC"}]) == [{"symbol": "AAA"}]
+    finally:
+        orchestrator.close()
+
+
+def test_symbol_on_both_nse_lists_is_fetched_once(tmp_path, exchanges):
+    nse, _ = exchanges
+    orchestrator = _run(tmp_path, "refresh")
+    # DUP is listed twice on Mainboard and again on SME
+    assert nse.detail_calls.count("DUP") == 1
+    assert list(orchestrator.store.data) == ["AAA", "DUP", "SMEX", "BSEONLY"]
+
+
+def test_reset_progress_clears_attempts_between_runs(tmp_path, exchanges):
+    nse, bse = exchanges
+    orchestrator = _orchestrator(tmp_path, use_cache=False)
+    try:
+        orchestrator.refresh()
+        orchestrator.full_refresh()
+    finally:
+        orchestrator.close()
+    # Each run fetches its symbols again instead of treating them as attempted
+    assert nse.detail_calls.count("DUP") == 2
+    assert bse.meta_calls.count("500002") == 2
+
@@ -0,0 +1,68 @@
+"""Deterministic tests for the adapters' shared TokenBucket.
+
+time.monotonic and time.sleep are patched: the clock only moves when a test
+advances it, and sleeps are recorded instead of taken.
+"""
+
+import pytest
+
+from src import rate_limiter as rate_limiter_module
+from src.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter_module.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_burst_is_free_then_waiters_reserve_successive_slots(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    # No time passes between calls, as with concurrent workers: each waiter
+    # reserves the next 1/rate slot instead of all waking together
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == pytest.approx([0.1, 0.2])
+
+
+def test_tokens_refill_at_rate(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+
+    clock.now += 0.2  # two tokens back
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == pytest.approx([0.1])
+
+
+def test_idle_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    clock.now += 60
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == pytest.approx([0.1])
@@ -0,0 +1,125 @@
+"""Offline tests for the producer Store's JSONL journal (no network).
+
+Covers crash recovery: replaying a journal left by an interrupted run,
+tolerating a torn final line, and discarding the journal on save/clear.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("markets_house")  # producer dependency (uv sync installs it)
+
+from src.models import IndustryInfo
+from src.store import Store
+
+INFO_A = IndustryInfo("Macro A", "Sector A", "Industry A", "Basic A")
+INFO_B = IndustryInfo("Macro B", "Sector B", "Industry B", "Basic B")
+
+
+@pytest.fixture()
+def store_path(tmp_path):
+    return tmp_path / "out" / "industry_data.json"
+
+
+def _interrupted_run(path, updates):
+    """Journal updates, then close without save() as a run that raised would."""
+    store = Store(filepath=str(path))
+    store.load()
+    for symbol, info in updates:
+        store.update_stock(symbol, info)
+    store.close()
+
+
+def test_replay_after_interrupted_run(store_path):
+    _interrupted_run(store_path, [("AAA", INFO_A), ("BBB", INFO_B)])
+    assert not store_path.exists()
+
+    store = Store(filepath=str(store_path))
+    store.load()
+    assert store.get_stock("AAA") == INFO_A
+    assert store.get_stock("BBB") == INFO_B
+    assert isinstance(store.get_stock("AAA"), IndustryInfo)
+
+
+def test_replay_skips_torn_line_and_appends_after_it(store_path):
+    _interrupted_run(store_path, [("AAA", INFO_A)])
+    journal = store_path.parent / (store_path.name + ".wal")
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('["BBB", ["Macro B", "Sec')  # crash mid-write
+
+    store = Store(filepath=str(store_path))
+    store.load()
+    assert store.get_stock("AAA") == INFO_A
+    assert store.get_stock("BBB") is None
+
+    # The next append must start on its own line, not extend the torn one
+    store.update_stock("CCC", INFO_B)
+    store.close()
+
+    resumed = Store(filepath=str(store_path))
+    resumed.load()
+    assert resumed.get_stock("AAA") == INFO_A
+    assert resumed.get_stock("CCC") == INFO_B
+
+
+def test_replay_skips_lines_that_are_not_pairs(store_path):
+    journal = store_path.parent / (store_path.name + ".wal")
+    journal.parent.mkdir(parents=True)
+    not_pairs = ['5', '"ab"', '{"X": 1, "Y": 2}', '[1, ["a", "b", "c", "d"]]', '["BBB", "abcd"]', '["CCC"]']
+    journal.write_text(
+        "\n".join(not_pairs) + '\n["AAA", ' + json.dumps(list(INFO_A)) + "]\n", encoding="utf-8"
+    )
+
+    store = Store(filepath=str(store_path))
+    store.load()
+    assert list(store.data) == ["AAA"]
+
+
+def test_save_writes_artifact_and_removes_journal(store_path):
+    store = Store(filepath=str(store_path))
+    store.load()
+    store.update_stock("AAA", INFO_A)
+    journal = store_path.parent / (store_path.name + ".wal")
+    assert journal.exists()
+
+    store.save()
+    assert not journal.exists()
+    payload = json.loads(store_path.read_text(encoding="utf-8"))
+    assert payload["data"] == {"AAA": list(INFO_A)}
+
+
+def test_failed_reload_still_saves(store_path):
+    store = Store(filepath=str(store_path))
+    store.load()
+    store.update_stock("AAA", INFO_A)
+    store.save()
+
+    store.load()  # clean load: nothing to write
+    store_path.write_text("{not json", encoding="utf-8")
+    store.load()  # starts fresh; the corrupt file must be replaced
+    store.update_stock("BBB", INFO_B)
+    store.save()
+    payload = json.loads(store_path.read_text(encoding="utf-8"))
+    assert payload["data"] == {"BBB": list(INFO_B)}
+
+    store_path.write_text('{"data": {}}', encoding="utf-8")
+    store.load()  # invalid structure (no metadata) also starts fresh
+    store.save()
+    assert "metadata" in json.loads(store_path.read_text(encoding="utf-8"))
+
+
+def test_clear_discards_journal(store_path):
+    _interrupted_run(store_path, [("AAA", INFO_A)])
+    journal = store_path.parent / (store_path.name + ".wal")
+    assert journal.exists()
+
+    store = Store(filepath=str(store_path))
+    store.load()
+    store.clear()
+    assert not journal.exists()
+    assert store.data == {}
+
+    fresh = Store(filepath=str(store_path))
+    fresh.load()
+    assert fresh.data == {}